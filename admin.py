@@ -0,0 +1,11 @@
+import os
+import secrets
+from fastapi import Header, HTTPException
+
+# Admin routes are disabled unless ADMIN_TOKEN is set in the environment.
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN", "")
+
+def require_admin(x_admin_token: str = Header("")):
+    """Dependency for /admin routes: checks the X-Admin-Token header."""
+    if not ADMIN_TOKEN or not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Forbidden")
@@ -1,8 +1,17 @@
 from fastapi import APIRouter
 from fastapi.responses import FileResponse
+from stats import StatEvent, stats_store
 
 router = APIRouter()
 
 @router.get("/fishwish")
 async def fishwish():
-    return FileResponse("pages/fishwish.html")
\ No newline at end of file
+    return FileResponse("pages/fishwish.html")
+
+@router.post("/fishwish/api/stats")
+async def record_stat(event: StatEvent):
+    return stats_store.record("fishwish", event)
+
+@router.get("/fishwish/api/stats")
+async def puzzle_stats(day: int):
+    return stats_store.summary("fishwish", day)
@@ -0,0 +1,116 @@
+"""
+Structured JSON logging for requests and game events.
+
+Records are put on a bounded queue by the event loop and formatted and
+written by a QueueListener thread, so logging never does I/O or JSON
+encoding on the loop. If the queue is full, records are dropped rather
+than blocking.
+
+LOG_FILE       write to this file instead of stdout
+LOG_SAMPLE_*   see SAMPLED_PATHS; 1-in-N access logging for polled routes
+"""
+
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+
+SAMPLED_PATHS = {
+    "/slumberparty/api/room-state": int(os.environ.get("LOG_SAMPLE_ROOM_STATE", "50")),
+}
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "event": record.msg,
+        }
+        entry.update(getattr(record, "fields", {}))
+        return json.dumps(entry)
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener and drops on overflow."""
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+_queue: queue.Queue = queue.Queue(maxsize=10000)
+_listener: logging.handlers.QueueListener | None = None
+
+logger = logging.getLogger("madebyali")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+logger.addHandler(NonBlockingQueueHandler(_queue))
+
+def start():
+    global _listener
+    if _listener is not None:
+        return
+    if os.environ.get("LOG_FILE"):
+        handler = logging.FileHandler(os.environ["LOG_FILE"])
+    else:
+        handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JsonFormatter())
+    _listener = logging.handlers.QueueListener(_queue, handler)
+    _listener.start()
+
+def stop():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def log_event(event: str, **fields):
+    logger.info(event, extra={"fields": fields})
+
+class AccessLogMiddleware:
+    """Pure ASGI access logger; sampled for the paths in SAMPLED_PATHS."""
+
+    def __init__(self, app):
+        self.app = app
+        self.counters = {path: 0 for path in SAMPLED_PATHS}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        path = scope["path"]
+        sample_rate = SAMPLED_PATHS.get(path, 1)
+        if sample_rate > 1:
+            self.counters[path] += 1
+            sampled = self.counters[path] % sample_rate == 1
+        else:
+            sampled = True
+
+        status = 500
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if sampled or status >= 500:
+                client = scope.get("client")
+                log_event(
+                    "request",
+                    method=scope["method"],
+                    path=path,
+                    status=status,
+                    duration_ms=round((time.perf_counter() - start) * 1000, 2),
+                    client=client[0] if client else None,
+                    sample_rate=sample_rate if sampled else 1,
+                )
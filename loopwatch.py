@@ -0,0 +1,138 @@
+"""
+Event-loop lag watchdog.
+
+A task on the loop sleeps LOOP_LAG_INTERVAL seconds at a time and records how
+late it wakes up; that lateness is the scheduling lag every request sees.
+A separate thread watches the task's heartbeat and, when the loop has been
+blocked for more than LOOP_STALL_MS, captures the loop thread's stack and
+the route whose handler is on it. Stalls are logged as "loop_stall" events
+and, with lag percentiles, served from /admin/loop.
+
+LOOP_DEBUG=1 also turns on asyncio debug mode, whose slow-callback warnings
+use the same threshold. Debug mode is expensive, so it is off by default.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from fastapi import APIRouter, Depends
+from admin import require_admin
+from logs import log_event
+
+LAG_INTERVAL = float(os.environ.get("LOOP_LAG_INTERVAL", "0.25"))
+STALL_THRESHOLD = float(os.environ.get("LOOP_STALL_MS", "100")) / 1000
+LOOP_DEBUG = os.environ.get("LOOP_DEBUG", "0") == "1"
+
+class LoopWatchdog:
+    def __init__(self):
+        self.lags: deque[float] = deque(maxlen=2400)  # about 10 minutes of samples
+        self.stalls: deque[dict] = deque(maxlen=50)
+        self.heartbeat = time.monotonic()
+        self.endpoints: dict = {}  # handler code object -> route path
+        self.loop_thread_id: int | None = None
+        self.pending_stall: dict | None = None
+        self.task: asyncio.Task | None = None
+        self.thread: threading.Thread | None = None
+        self.stopping = threading.Event()
+
+    def start(self, app):
+        loop = asyncio.get_running_loop()
+        if LOOP_DEBUG:
+            loop.set_debug(True)
+            loop.slow_callback_duration = STALL_THRESHOLD
+        self.endpoints = {
+            route.endpoint.__code__: route.path
+            for route in app.routes
+            if hasattr(route, "endpoint") and hasattr(route.endpoint, "__code__")
+        }
+        self.loop_thread_id = threading.get_ident()
+        self.heartbeat = time.monotonic()
+        self.stopping.clear()
+        self.task = loop.create_task(self._measure())
+        self.thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self.thread.start()
+
+    async def stop(self):
+        self.stopping.set()
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    async def _measure(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(LAG_INTERVAL)
+            lag = max(0.0, loop.time() - start - LAG_INTERVAL)
+            self.lags.append(lag)
+            self.heartbeat = time.monotonic()
+
+            stall = self.pending_stall
+            if stall is not None:
+                self.pending_stall = None
+                stall["duration_ms"] = round(lag * 1000, 1)
+                log_event("loop_stall", route=stall["route"], duration_ms=stall["duration_ms"],
+                          stack=stall["stack"])
+
+    def _watch(self):
+        """Watchdog thread: capture the loop's stack while it is blocked."""
+        reported = None
+        while not self.stopping.wait(LAG_INTERVAL / 2):
+            heartbeat = self.heartbeat
+            if heartbeat == reported or time.monotonic() - heartbeat < LAG_INTERVAL + STALL_THRESHOLD:
+                continue
+            frame = sys._current_frames().get(self.loop_thread_id)
+            if frame is None:
+                continue
+            reported = heartbeat
+            stall = {
+                "at": time.time(),
+                "route": self._route_for(frame),
+                "duration_ms": None,
+                "stack": traceback.format_stack(frame)[-15:],
+            }
+            self.stalls.append(stall)
+            self.pending_stall = stall
+
+    def _route_for(self, frame) -> str | None:
+        while frame is not None:
+            route = self.endpoints.get(frame.f_code)
+            if route is not None:
+                return route
+            frame = frame.f_back
+        return None
+
+    def percentiles(self) -> dict:
+        if not self.lags:
+            return {}
+        lags = sorted(self.lags)
+        def pct(p):
+            return round(lags[min(len(lags) - 1, int(p / 100 * len(lags)))] * 1000, 2)
+        return {"p50_ms": pct(50), "p90_ms": pct(90), "p99_ms": pct(99), "max_ms": round(lags[-1] * 1000, 2)}
+
+watchdog = LoopWatchdog()
+
+# --- Admin Routes ---
+
+router = APIRouter(prefix="/admin/loop", dependencies=[Depends(require_admin)])
+
+@router.get("")
+async def loop_stats():
+    return {
+        "interval_ms": LAG_INTERVAL * 1000,
+        "stall_threshold_ms": STALL_THRESHOLD * 1000,
+        "samples": len(watchdog.lags),
+        "lag": watchdog.percentiles(),
+        "stalls": list(watchdog.stalls),
+    }
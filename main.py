@@ -1,16 +1,49 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from fishwish import router as fishwish_router
 from transformers import router as transformers_router
-from slumberparty import router as slumberparty_router
+from slumberparty import router as slumberparty_router, start_shards, stop_shards
+from profiling import ProfilingMiddleware, router as profiling_router
+import logs
+from loopwatch import watchdog, router as loopwatch_router
+from stats import stats_store
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    logs.start()
+    await start_shards()
+    await stats_store.start()
+    watchdog.start(app)
+    yield
+    await watchdog.stop()
+    await stats_store.stop()
+    await stop_shards()
+    logs.stop()
 
+class BundleStaticFiles(StaticFiles):
+    """Daily game bundles are named by content hash, so only the manifest can change."""
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if str(full_path).endswith("manifest.json"):
+            response.headers["Cache-Control"] = "no-cache"
+        else:
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(logs.AccessLogMiddleware)
+
+app.mount("/static/fishwish-bundles", BundleStaticFiles(directory="static/fishwish-bundles", check_dir=False), name="fishwish-bundles")
 app.mount("/static", StaticFiles(directory="static"), name="static")
 app.include_router(fishwish_router)
 app.include_router(transformers_router)
 app.include_router(slumberparty_router)
+app.include_router(profiling_router)
+app.include_router(loopwatch_router)
 
 @app.get("/")
 async def home():
@@ -22,4 +55,4 @@ async def favicon():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000, access_log=False)
\ No newline at end of file
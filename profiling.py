@@ -0,0 +1,152 @@
+"""
+Opt-in request profiling.
+
+Profiles 1-in-N requests per route with cProfile and aggregates the results
+into one pstats.Stats per route. Requests under a mount such as /static
+share the mount's key and paths that match no route share UNMATCHED, so the
+number of keys is bounded by the number of routes. Dumps can be pulled from /admin/profile/dump
+and opened with snakeviz, flameprof or gprof2dot to get a flamegraph.
+
+Enable at startup with PROFILE_SAMPLE_RATE=N, or at runtime with
+POST /admin/profile/enable?sample_every=N. When disabled the middleware
+costs a single branch per request.
+
+Only one request is profiled at a time. Since all routes share one event
+loop, time spent in other requests while the sampled one is awaiting is
+included in its profile.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import re
+import tempfile
+from pathlib import Path
+from fastapi import APIRouter, Depends
+from fastapi.responses import FileResponse, PlainTextResponse
+from starlette.routing import Mount
+from admin import require_admin
+
+PROFILE_DIR = Path(os.environ.get("PROFILE_DIR", Path(tempfile.gettempdir()) / "madebyali-profiles"))
+UNMATCHED = "(unmatched)"
+
+class Profiler:
+    def __init__(self, sample_every: int = 0):
+        self.enabled = sample_every > 0
+        self.sample_every = sample_every or 100
+        self.counters: dict[str, int] = {}   # requests seen per route
+        self.samples: dict[str, int] = {}    # requests profiled per route
+        self.stats: dict[str, pstats.Stats] = {}
+        self.busy = False
+        self.routes: set[str] | None = None
+        self.mounts: tuple[str, ...] = ()
+
+    def route_key(self, scope) -> str:
+        """Collapse a request path to its route so keys can't grow with arbitrary URLs."""
+        if self.routes is None:
+            routes = scope["app"].routes
+            self.routes = {route.path for route in routes if not isinstance(route, Mount)}
+            self.mounts = tuple(route.path for route in routes if isinstance(route, Mount))
+        path = scope["path"]
+        if path in self.routes:
+            return path
+        for mount in self.mounts:
+            if path.startswith(mount + "/"):
+                return mount + "/*"
+        return UNMATCHED
+
+    def should_sample(self, path: str) -> bool:
+        count = self.counters.get(path, 0)
+        self.counters[path] = count + 1
+        return count % self.sample_every == 0
+
+    def record(self, path: str, profile: cProfile.Profile):
+        self.samples[path] = self.samples.get(path, 0) + 1
+        if path in self.stats:
+            self.stats[path].add(profile)
+        else:
+            self.stats[path] = pstats.Stats(profile, stream=io.StringIO())
+
+    def reset(self):
+        self.counters.clear()
+        self.samples.clear()
+        self.stats.clear()
+
+profiler = Profiler(int(os.environ.get("PROFILE_SAMPLE_RATE", "0")))
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware so the disabled path stays a single check."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if not profiler.enabled:
+            return await self.app(scope, receive, send)
+        if scope["type"] != "http" or profiler.busy:
+            return await self.app(scope, receive, send)
+        key = profiler.route_key(scope)
+        if not profiler.should_sample(key):
+            return await self.app(scope, receive, send)
+
+        profiler.busy = True
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profile.disable()
+            profiler.busy = False
+            profiler.record(key, profile)
+
+# --- Admin Routes ---
+
+router = APIRouter(prefix="/admin/profile", dependencies=[Depends(require_admin)])
+
+@router.get("")
+async def profile_summary(limit: int = 20):
+    out = io.StringIO()
+    out.write(f"enabled: {profiler.enabled}, sample_every: {profiler.sample_every}\n\n")
+    for path, stats in sorted(profiler.stats.items()):
+        out.write(f"=== {path} ({profiler.samples[path]} of {profiler.counters[path]} requests) ===\n")
+        stats.stream = out
+        stats.sort_stats("cumulative").print_stats(limit)
+    return PlainTextResponse(out.getvalue())
+
+@router.get("/dump")
+async def profile_dump(path: str = ""):
+    """Download a pstats file for one route, or for all routes merged."""
+    if path:
+        if path not in profiler.stats:
+            return {"error": "No samples for path"}
+        stats = profiler.stats[path]
+    else:
+        if not profiler.stats:
+            return {"error": "No samples yet"}
+        stats = pstats.Stats(stream=io.StringIO())
+        stats.add(*profiler.stats.values())
+
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    name = re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_") or ("root" if path else "all")
+    dump_path = PROFILE_DIR / f"{name}.pstats"
+    stats.dump_stats(dump_path)
+    return FileResponse(dump_path, filename=dump_path.name)
+
+@router.post("/enable")
+async def profile_enable(sample_every: int = 100):
+    if sample_every < 1:
+        return {"error": "sample_every must be at least 1"}
+    profiler.sample_every = sample_every
+    profiler.enabled = True
+    return {"ok": True, "sample_every": sample_every}
+
+@router.post("/disable")
+async def profile_disable():
+    profiler.enabled = False
+    return {"ok": True}
+
+@router.post("/reset")
+async def profile_reset():
+    profiler.reset()
+    return {"ok": True}
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Benchmark page serving, static JSON delivery, app startup and word-list loading.
+
+Routes are driven in-process through the ASGI app, so the numbers measure the
+app and file serving without network noise. Results are written as JSON so
+runs can be compared across commits. benchmark-results/ is gitignored:
+
+    python scripts/benchmark.py
+    python scripts/benchmark.py --compare scripts/benchmark-results/<old>.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+repo_dir = Path(__file__).parent.parent
+results_dir = Path(__file__).parent / "benchmark-results"
+
+ROUTES = [
+    "/",
+    "/fishwish",
+    "/transformers",
+    "/slumberparty",
+    "/favicon.ico",
+    "/static/transformer-games.json",
+    "/static/fishwish-games.json",
+    "/static/common-words.json",
+    "/static/all-words-8-letter-max.json",
+    "/static/all-words.json",
+]
+
+WORD_LISTS = ["common-words.json", "all-words-8-letter-max.json", "all-words.json"]
+
+
+async def asgi_get(app, path):
+    """Issue a GET against an ASGI app and return (status, body size)."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 0),
+        "server": ("localhost", 8000),
+    }
+    status = 0
+    size = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status, size
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            size += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, size
+
+
+def bench_routes(duration):
+    os.chdir(repo_dir)
+    sys.path.insert(0, str(repo_dir))
+    from main import app
+
+    async def run():
+        results = {}
+        for path in ROUTES:
+            status, size = await asgi_get(app, path)
+            if status != 200:
+                print(f"  {path}: HTTP {status}, skipping")
+                continue
+            count = 0
+            total_bytes = 0
+            start = time.perf_counter()
+            while time.perf_counter() - start < duration:
+                _, size = await asgi_get(app, path)
+                total_bytes += size
+                count += 1
+            elapsed = time.perf_counter() - start
+            results[path] = {
+                "requests_per_sec": count / elapsed,
+                "bytes_per_sec": total_bytes / elapsed,
+                "response_bytes": size,
+            }
+            print(f"  {path}: {count / elapsed:.0f} req/s, {total_bytes / elapsed / 1e6:.1f} MB/s")
+        return results
+
+    return asyncio.run(run())
+
+
+def bench_cold_start(repeats):
+    """Time `import main` in a fresh interpreter."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "import main"], cwd=repo_dir, check=True)
+        times.append(time.perf_counter() - start)
+    print(f"  import main: median {statistics.median(times) * 1000:.0f} ms")
+    return {"import_main_sec": {"median": statistics.median(times), "min": min(times)}}
+
+
+def bench_word_lists(repeats, queries):
+    results = {}
+    for name in WORD_LISTS:
+        path = repo_dir / "static" / name
+        load_times = []
+        set_times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            with open(path, 'r') as f:
+                words = json.load(f)
+            load_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            word_set = set(words)
+            set_times.append(time.perf_counter() - start)
+
+        rng = random.Random(0)
+        probes = [rng.choice(words) for _ in range(queries // 2)]
+        probes += [w[::-1] + "q" for w in probes]
+        start = time.perf_counter()
+        for w in probes:
+            w in word_set
+        query_time = time.perf_counter() - start
+
+        results[name] = {
+            "words": len(words),
+            "json_load_sec": statistics.median(load_times),
+            "set_build_sec": statistics.median(set_times),
+            "query_ns": query_time / len(probes) * 1e9,
+        }
+        print(f"  {name}: load {statistics.median(load_times) * 1000:.1f} ms, "
+              f"set {statistics.median(set_times) * 1000:.1f} ms, "
+              f"query {query_time / len(probes) * 1e9:.0f} ns")
+    return results
+
+
+def git_revision():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=repo_dir,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(old, new, prefix=""):
+    """Print numeric metrics that exist in both result dicts with % change."""
+    for key, value in new.items():
+        if key not in old or key == "timestamp":
+            continue
+        if isinstance(value, dict):
+            compare(old[key], value, f"{prefix}{key} ")
+        elif isinstance(value, (int, float)) and old[key]:
+            change = (value - old[key]) / old[key] * 100
+            print(f"  {prefix}{key}: {old[key]:.4g} -> {value:.4g} ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=1.0, help="seconds per route")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=100000)
+    parser.add_argument("--output", type=Path, help="results file (default: benchmark-results/<rev>.json)")
+    parser.add_argument("--compare", type=Path, help="previous results file to compare against")
+    args = parser.parse_args()
+
+    revision = git_revision()
+
+    print("=== Word Lists ===")
+    word_lists = bench_word_lists(args.repeats, args.queries)
+    print("\n=== Cold Start ===")
+    cold_start = bench_cold_start(args.repeats)
+    print("\n=== Routes ===")
+    routes = bench_routes(args.duration)
+
+    results = {
+        "revision": revision,
+        "timestamp": time.time(),
+        "python": sys.version.split()[0],
+        "word_lists": word_lists,
+        "cold_start": cold_start,
+        "routes": routes,
+    }
+
+    output = args.output or results_dir / f"{revision}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nWrote {output}")
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            old = json.load(f)
+        print(f"\n=== Compared to {old.get('revision', args.compare)} ===")
+        compare(old, results)
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
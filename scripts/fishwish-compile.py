@@ -1,3 +1,24 @@
+"""
+Compile fishwish-clues.json into games for the Fishwish page.
+
+Default mode writes every game, with each word's first clue variant, to
+static/fishwish-games.json.
+
+--bundles writes one small file per day of the rotation instead, each with
+exactly one clue variant per word, to static/fishwish-bundles/:
+
+  manifest.json    {"first_day": ..., "bundles": [<hash>, ...]}; day d plays bundles[d % len(bundles)]
+  <hash>.json      one game, named by content hash so it can be cached forever
+
+Game set d % len(sets) is played on day d, and each time a set comes round
+again the next clue variant is used. The left column order and match_order
+are seeded per set, so every rotation of a set and fishwish-games.json agree
+on them; saved progress indexes into the left column. Output depends only
+on the clues and --seed, so reruns are byte-identical.
+"""
+
+import argparse
+import hashlib
 import json
 import random
 from pathlib import Path
@@ -5,16 +26,37 @@ from pathlib import Path
 script_dir = Path(__file__).parent
 clues_file = script_dir / "fishwish-clues.json"
 output_file = script_dir.parent / "static" / "fishwish-games.json"
+bundles_dir = script_dir.parent / "static" / "fishwish-bundles"
+
+# Mirrors firstDay in pages/fishwish.html
+FIRST_DAY = "2025-09-20"
+
+
+def variants(item):
+    """Clue variants for a [clue or [clues...], word] item."""
+    clues = item[0]
+    return clues if isinstance(clues, list) else [clues]
+
 
-with open(clues_file, 'r') as f:
-    clue_sets = json.load(f)
+def shuffled_match_order(left, rng):
+    """Shuffle the left column, never leaving every pair lined up."""
+    match_order = list(range(4))
+
+    combined = list(zip(left, match_order))
+    while match_order == [0, 1, 2, 3]:
+        rng.shuffle(combined)
+        left, match_order = zip(*combined)
+        left = list(left)
+        match_order = list(match_order)
+    return left, match_order
 
-games = []
 
-for clue_set in clue_sets:
+def build_game(clue_set, rng, variant=0):
     if len(clue_set) != 8:
         raise ValueError(f"Expected 8 clues in set, got {len(clue_set)}")
 
+    clue_set = [[variants(item)[variant % len(variants(item))], item[1]] for item in clue_set]
+
     pairs = []
     for i in range(0, 8, 2):
         left_item = clue_set[i]
@@ -25,24 +67,68 @@ for clue_set in clue_sets:
 
     right = [pair[1] for pair in pairs]
 
-    match_order = list(range(4))
-
-    combined = list(zip(left, match_order))
-    while match_order == [0, 1, 2, 3]:
-        random.shuffle(combined)
-        left, match_order = zip(*combined)
-        left = list(left)
-        match_order = list(match_order)
+    left, match_order = shuffled_match_order(left, rng)
 
-    game = {
+    return {
         "left": left,
         "right": right,
         "match_order": match_order
     }
 
-    games.append(game)
 
-with open(output_file, 'w') as f:
-    json.dump(games, f, indent=4)
+def set_rng(seed, set_index):
+    """Shuffle RNG for one clue set, shared by its bundles and its fishwish-games.json entry."""
+    return random.Random(f"{seed}:{set_index}")
+
+
+def compile_games(clue_sets, seed):
+    games = [build_game(clue_set, set_rng(seed, i)) for i, clue_set in enumerate(clue_sets)]
+
+    with open(output_file, 'w') as f:
+        json.dump(games, f, indent=4)
+    print(f"Wrote {len(games)} games to {output_file}")
+
+
+def compile_bundles(clue_sets, seed):
+    max_variants = max(len(variants(item)) for clue_set in clue_sets for item in clue_set)
+    rotation = len(clue_sets) * max_variants
+
+    bundles_dir.mkdir(parents=True, exist_ok=True)
+    hashes = []
+    for day in range(rotation):
+        set_index = day % len(clue_sets)
+        game = build_game(clue_sets[set_index], set_rng(seed, set_index), variant=day // len(clue_sets))
+        data = json.dumps(game, separators=(',', ':'), ensure_ascii=False, sort_keys=True).encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        (bundles_dir / f"{digest}.json").write_bytes(data)
+        hashes.append(digest)
+
+    # Drop bundles from earlier runs that are no longer referenced
+    for path in bundles_dir.glob("*.json"):
+        if path.name != "manifest.json" and path.stem not in hashes:
+            path.unlink()
+
+    manifest = {"first_day": FIRST_DAY, "bundles": hashes}
+    with open(bundles_dir / "manifest.json", 'w') as f:
+        json.dump(manifest, f, separators=(',', ':'))
+    print(f"Wrote {rotation} daily bundles ({len(clue_sets)} sets x {max_variants} clue variants) to {bundles_dir}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile Fishwish clue sets into games.")
+    parser.add_argument("--bundles", action="store_true", help="write per-day bundles and a manifest")
+    parser.add_argument("--seed", default="fishwish", help="seed for match order shuffling")
+    args = parser.parse_args()
+
+    with open(clues_file, 'r') as f:
+        clue_sets = json.load(f)
+
+    if args.bundles:
+        compile_bundles(clue_sets, args.seed)
+    else:
+        compile_games(clue_sets, args.seed)
+    return 0
 
 
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,84 @@
+"""
+Bulk transformation queries over a dictionary stored as letter-count matrices.
+
+Words are grouped by length, and each group is a (words x 26) uint8 matrix
+of letter counts. A whole batch of query words is answered with a few
+broadcast comparisons per length group instead of string probes per word:
+
+  anagrams            same length, same counts
+  add_one_anagrams    one letter longer, counts >= the query's  (insert a letter, then rearrange)
+  drop_one_anagrams   one letter shorter, counts <= the query's (remove a letter, then rearrange)
+
+    index = LetterCountIndex(words)
+    index.anagrams(["stone", "notes"])   # [["notes", "onset", ...], ["onset", "stone", ...]]
+"""
+
+import numpy as np
+
+# Upper bound on the (queries x words x 26) comparison block, in bytes
+BLOCK_BYTES = 1 << 25
+
+
+def letter_counts(words):
+    """(len(words) x 26) uint8 letter counts for lowercase a-z words."""
+    lengths = np.fromiter((len(w) for w in words), dtype=np.int64, count=len(words))
+    letters = np.frombuffer(''.join(words).encode('ascii'), dtype=np.uint8) - ord('a')
+    rows = np.repeat(np.arange(len(words)), lengths)
+    counts = np.zeros((len(words), 26), dtype=np.uint8)
+    np.add.at(counts, (rows, letters), 1)
+    return counts
+
+
+class LetterCountIndex:
+    def __init__(self, words):
+        words = sorted({w.lower() for w in words if w.isascii() and w.isalpha()})
+        counts = letter_counts(words)
+        lengths = np.array([len(w) for w in words])
+        self.groups = {}
+        for length in np.unique(lengths):
+            rows = np.flatnonzero(lengths == length)
+            self.groups[int(length)] = ([words[i] for i in rows], counts[rows])
+
+    def anagrams(self, words):
+        return self._query(words, 0)
+
+    def add_one_anagrams(self, words):
+        return self._query(words, 1)
+
+    def drop_one_anagrams(self, words):
+        return self._query(words, -1)
+
+    def _query(self, words, delta):
+        """For each query word, the dictionary words of length len(word) + delta that match its counts."""
+        words = [w.lower() for w in words]
+        results = [[] for _ in words]
+        valid = [i for i, w in enumerate(words) if w.isascii() and w.isalpha()]
+        if not valid:
+            return results
+        query_counts = letter_counts([words[i] for i in valid])
+        query_lengths = np.array([len(words[i]) for i in valid])
+
+        for length in np.unique(query_lengths):
+            group = self.groups.get(int(length) + delta)
+            if group is None:
+                continue
+            group_words, group_counts = group
+            rows = np.flatnonzero(query_lengths == length)
+            chunk = max(1, BLOCK_BYTES // (len(group_words) * 26))
+
+            for start in range(0, len(rows), chunk):
+                block = rows[start:start + chunk]
+                q = query_counts[block][:, None, :]
+                w = group_counts[None, :, :]
+                if delta == 0:
+                    match = (w == q).all(axis=2)
+                elif delta > 0:
+                    match = (w >= q).all(axis=2)
+                else:
+                    match = (w <= q).all(axis=2)
+
+                for r, c in zip(*np.nonzero(match)):
+                    query = valid[block[r]]
+                    if group_words[c] != words[query]:
+                        results[query].append(group_words[c])
+        return results
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Report memory per Slumber Party room and per player.
+
+Builds rooms directly from slumberparty.Room/Player (bypassing room ID
+allocation) and measures them with tracemalloc, to size a node for a given
+number of concurrent rooms.
+
+    python scripts/slumberparty-capacity.py --rooms 100000 --players 8
+"""
+
+import argparse
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from slumberparty import Player, Position, Room, Team
+
+
+def build_rooms(count, players_per_room, playing):
+    rooms = {}
+    for rid in range(1, count + 1):
+        room = Room(rid, Player(f"Player{rid}-0"))
+        for i in range(1, players_per_room):
+            room.players.append(Player(f"Player{rid}-{i}"))
+        if playing:
+            for p in room.players:
+                p.team = random.choice((Team.STRAIGHT, Team.GAY))
+                p.position = Position.NORMAL
+            room.state = "playing"
+        rooms[rid] = room
+    return rooms
+
+
+def measure(count, players_per_room, playing):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    rooms = build_rooms(count, players_per_room, playing)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del rooms
+    return after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=100000)
+    parser.add_argument("--players", type=int, default=8, help="players per room")
+    args = parser.parse_args()
+    if args.rooms < 1:
+        parser.error("--rooms must be at least 1")
+    if args.players < 2:
+        # The per-player cost is measured against 1-player rooms
+        parser.error("--players must be at least 2")
+
+    # Per-player cost is the slope between two room sizes
+    small = measure(args.rooms, 1, playing=True)
+    full = measure(args.rooms, args.players, playing=True)
+    per_player = (full - small) / (args.rooms * (args.players - 1))
+    per_room = small / args.rooms - per_player
+
+    print(f"Rooms: {args.rooms}, players per room: {args.players}")
+    print(f"  total:      {full / 1e6:.1f} MB")
+    print(f"  per room:   {full / args.rooms:.0f} bytes with players")
+    print(f"  room only:  {per_room:.0f} bytes")
+    print(f"  per player: {per_player:.0f} bytes (including name string)")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Score Transformers chains by difficulty.
+
+For every step of every chain this computes, in one batch with NumPy:
+  - branching: how many legal moves the current word has (more = harder to spot the intended one)
+  - rank: the intended next word's rank in common-words.json (rarer = harder)
+  - type: removal, insertion, replacement or anagram
+
+and combines them into one score per chain. Input is either a JSON list of
+chains (default: static/transformer-games.json) or the output of
+transformer-explorer.py, one chain per line.
+
+    python transformer-difficulty.py
+    python transformer-difficulty.py candidates.txt --max-score 40 --output scored.json
+    python transformer-difficulty.py candidates.txt --schedule weekly.json
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+script_dir = Path(__file__).parent
+sys.path.insert(0, str(script_dir.parent))
+from wordgraph import load_word_graph
+
+WORDS_FILE = script_dir.parent / "static" / "all-words-8-letter-max.json"
+
+STEP_TYPES = ["removal", "insertion", "replacement", "anagram"]
+TYPE_WEIGHTS = np.array([0.0, 0.5, 0.25, 1.5])
+BRANCH_WEIGHT = 1.0
+RANK_WEIGHT = 0.5
+
+
+def load_chains(path):
+    """Read a JSON list of chains, or explorer output lines that start with a JSON array."""
+    text = Path(path).read_text()
+    try:
+        return [[w.lower() for w in chain] for chain in json.loads(text)]
+    except json.JSONDecodeError:
+        pass
+    decoder = json.JSONDecoder()
+    chains = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("["):
+            chain, _ = decoder.raw_decode(line)
+            chains.append([w.lower() for w in chain])
+    return chains
+
+
+def word_tables(graph):
+    """Per-word arrays (legal move count, common-word rank, anagram key id, length) plus sorted edge keys."""
+    words = graph.words
+    offsets = np.frombuffer(graph.offsets, dtype=np.int32)
+    branching = np.diff(offsets)
+
+    # Every edge as one sorted int64 key, so (cur, nxt) pairs can be checked with one searchsorted
+    edges = np.frombuffer(graph.edges, dtype=np.int32)
+    sources = np.repeat(np.arange(len(words), dtype=np.int64), branching)
+    edge_keys = np.sort(sources * len(words) + edges)
+
+    with open(script_dir.parent / "static" / "common-words.json", 'r') as f:
+        common_words = json.load(f)
+    rank = np.full(len(words), len(common_words), dtype=np.int32)
+    for r, word in enumerate(common_words):
+        i = words.find(word)
+        if i >= 0 and rank[i] == len(common_words):
+            rank[i] = r
+
+    keys = {}
+    anagram_key = np.array([keys.setdefault(''.join(sorted(w)), len(keys)) for w in words], dtype=np.int32)
+    lengths = np.array([len(w) for w in words], dtype=np.int32)
+    return branching, rank, anagram_key, lengths, edge_keys
+
+
+def score_chains(chains, graph):
+    """Return (scores, step arrays) for a batch of chains; invalid chains score NaN."""
+    branching, rank, anagram_key, lengths, edge_keys = word_tables(graph)
+    width = max(len(chain) for chain in chains)
+
+    ids = np.full((len(chains), width), -1, dtype=np.int32)
+    for row, chain in enumerate(chains):
+        ids[row, :len(chain)] = [graph.words.find(w) for w in chain]
+
+    present = ids >= 0
+    padded = np.zeros((len(chains), width), dtype=bool)
+    for row, chain in enumerate(chains):
+        padded[row, len(chain):] = True
+    safe = np.where(present, ids, 0)
+
+    cur, nxt = safe[:, :-1], safe[:, 1:]
+    step_mask = present[:, :-1] & present[:, 1:]
+    invalid = (~present & ~padded).any(axis=1)
+
+    step_branching = np.where(step_mask, branching[cur], 0)
+    step_rank = np.where(step_mask, rank[nxt], 0)
+
+    diff = lengths[nxt] - lengths[cur]
+    same_letters = anagram_key[nxt] == anagram_key[cur]
+    step_type = np.select(
+        [diff == -1, diff == 1, (diff == 0) & ~same_letters, (diff == 0) & same_letters],
+        [0, 1, 2, 3],
+        default=-1,
+    )
+    # A step is only legal if nxt is one of cur's neighbors in the graph
+    pair_keys = cur.astype(np.int64) * len(graph.words) + nxt
+    found = np.searchsorted(edge_keys, pair_keys)
+    adjacent = edge_keys[np.minimum(found, len(edge_keys) - 1)] == pair_keys
+    invalid |= (step_mask & ((step_type < 0) | ~adjacent)).any(axis=1)
+    step_type = np.where(step_mask, step_type, -1)
+
+    step_score = (
+        BRANCH_WEIGHT * np.log2(1 + step_branching)
+        + RANK_WEIGHT * np.log2(1 + step_rank)
+        + np.where(step_type >= 0, TYPE_WEIGHTS[np.maximum(step_type, 0)], 0)
+    )
+    scores = np.where(step_mask, step_score, 0).sum(axis=1)
+    scores[invalid] = np.nan
+    return scores, step_branching, step_rank, step_type
+
+
+def weekly_schedule(chains, scores):
+    """Order chains so each week runs easy (first day) to hard (last day)."""
+    valid = np.flatnonzero(~np.isnan(scores))
+    ordered = valid[np.argsort(scores[valid], kind="stable")]
+    weeks = len(ordered) // 7
+    if weeks == 0:
+        return []
+    # Day d of every week draws from the d-th seventh of the difficulty range
+    buckets = ordered[:weeks * 7].reshape(7, weeks)
+    return [chains[i] for i in buckets.T.ravel()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", nargs="?", default=script_dir.parent / "static" / "transformer-games.json")
+    parser.add_argument("--min-score", type=float)
+    parser.add_argument("--max-score", type=float)
+    parser.add_argument("--output", type=Path, help="write scored chains (sorted easy to hard) as JSON")
+    parser.add_argument("--schedule", type=Path, help="write chains in an easy-to-hard weekly rotation as JSON")
+    args = parser.parse_args()
+
+    chains = load_chains(args.input)
+    if not chains:
+        print("No chains found")
+        return 1
+    print("Building word graph...")
+    graph = load_word_graph(WORDS_FILE, shared=False)
+    scores, step_branching, step_rank, step_type = score_chains(chains, graph)
+
+    keep = ~np.isnan(scores)
+    if args.min_score is not None:
+        keep &= scores >= args.min_score
+    if args.max_score is not None:
+        keep &= scores <= args.max_score
+    order = [i for i in np.argsort(scores, kind="stable") if keep[i]]
+
+    results = []
+    for i in order:
+        steps = len(chains[i]) - 1
+        results.append({
+            "chain": chains[i],
+            "score": round(float(scores[i]), 2),
+            "branching": step_branching[i, :steps].tolist(),
+            "next_rank": step_rank[i, :steps].tolist(),
+            "types": [STEP_TYPES[t] for t in step_type[i, :steps]],
+        })
+        print(f"{scores[i]:7.2f}  {' -> '.join(chains[i])}")
+
+    invalid = int(np.isnan(scores).sum())
+    print(f"\nScored {len(chains)} chains, kept {len(results)}, invalid {invalid}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {args.output}")
+
+    if args.schedule:
+        schedule = weekly_schedule([chains[i] for i in order], scores[order])
+        with open(args.schedule, 'w') as f:
+            json.dump(schedule, f, indent=2)
+        print(f"Wrote {len(schedule) // 7} weeks to {args.schedule}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
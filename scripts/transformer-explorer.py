@@ -1,6 +1,7 @@
 import random
 from pathlib import Path
 import json
+from lettercounts import LetterCountIndex
 
 script_dir = Path(__file__).parent
 
@@ -10,6 +11,7 @@ with open(script_dir.parent / "static" / "common-words.json", 'r') as f:
 
 common_words = set(common_words_list)
 very_common_words = set(common_words_list[:10000])
+letter_index = LetterCountIndex(common_words)
 
 def find_removals(word):
     """Find valid words by removing a single letter."""
@@ -42,15 +44,7 @@ def find_replacements(word):
 
 def find_anagrams(word):
     """Find valid words by rearranging the letters."""
-    results = []
-    sorted_word = ''.join(sorted(word))
-
-    # More efficient: check if any word in the word bank is an anagram
-    for candidate in common_words:
-        if candidate != word and ''.join(sorted(candidate)) == sorted_word:
-            results.append(candidate)
-
-    return results
+    return letter_index.anagrams([word])[0]
 
 def explore_word(word, max_depth=7, break_on_first=False):
     word = word.lower()
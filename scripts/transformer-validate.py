@@ -6,6 +6,11 @@ script_dir = Path(__file__).parent
 with open(script_dir.parent / "static" / "all-words-8-letter-max.json", 'r') as f:
     common_words = set(json.load(f))
 
+# Sorted letters -> words with those letters, built once for anagram checks
+anagram_groups = {}
+for w in common_words:
+    anagram_groups.setdefault(''.join(sorted(w)), []).append(w)
+
 def find_removals(word):
     """Find valid words by removing a single letter."""
     results = []
@@ -37,14 +42,8 @@ def find_replacements(word):
 
 def find_anagrams(word):
     """Find valid words by rearranging the letters."""
-    results = []
-    sorted_word = ''.join(sorted(word))
-
-    for candidate in common_words:
-        if candidate != word and ''.join(sorted(candidate)) == sorted_word:
-            results.append(candidate)
-
-    return results
+    candidates = anagram_groups.get(''.join(sorted(word)), [])
+    return [candidate for candidate in candidates if candidate != word]
 
 def is_valid_transformation(word1, word2):
     """Check if word2 is a valid transformation of word1."""
@@ -5,24 +5,35 @@ Generate common-words.json, all-words.json, and all-words-8-letter-max.json for
 common-words.json: 20k most common words from NLTK Brown corpus
 all-words.json: Official Scrabble word list from norvig.com
 all-words-8-letter-max.json: Scrabble words filtered to 8 letters or less
+all-words-8-letter-max.bloom: Bloom filter of all-words-8-letter-max.json for client-side validation
+
+Run with --bloom-only to rebuild just the Bloom filter from the existing JSON.
 """
 
+import argparse
 import json
-import nltk
+import math
+import random
+import string
+import struct
 import urllib.request
 from collections import Counter
 from pathlib import Path
 
-# Download required NLTK data
-try:
-    nltk.data.find('corpora/brown')
-except LookupError:
-    print("Downloading NLTK Brown corpus...")
-    nltk.download('brown')
+BLOOM_MAGIC = b"BLM1"
 
 
 def get_brown_words():
     """Get word frequency from Brown corpus."""
+    import nltk
+
+    # Download required NLTK data
+    try:
+        nltk.data.find('corpora/brown')
+    except LookupError:
+        print("Downloading NLTK Brown corpus...")
+        nltk.download('brown')
+
     print("Loading Brown corpus...")
     brown_words = [word.lower() for word in nltk.corpus.brown.words() if word.isalpha()]
     return Counter(brown_words)
@@ -50,10 +61,96 @@ def download_scrabble_words():
         return None
 
 
+def fnv1a(word, seed):
+    """32-bit FNV-1a over the word's bytes, starting from seed. Mirrored in pages/transformers.html."""
+    h = seed
+    for byte in word.encode('utf-8'):
+        h ^= byte
+        h = (h * 0x01000193) & 0xFFFFFFFF
+    return h
+
+
+def bloom_positions(word, m, k):
+    """Bit positions for a word, by double hashing two FNV-1a variants."""
+    h1 = fnv1a(word, 0x811C9DC5)
+    h2 = fnv1a(word, 0x5BD1E995) | 1
+    return [(h1 + i * h2) % m for i in range(k)]
+
+
+def build_bloom_filter(words, fp_rate):
+    """
+    Build a Bloom filter sized for the given false-positive rate.
+
+    Format: b"BLM1", then little-endian uint32 bit count, uint32 hash count and
+    uint32 word count, then the bit array (bit j is byte j >> 3, mask 1 << (j & 7)).
+    """
+    n = len(words)
+    m = math.ceil(-n * math.log(fp_rate) / math.log(2) ** 2)
+    m = (m + 7) // 8 * 8
+    k = max(1, round(m / n * math.log(2)))
+
+    bits = bytearray(m // 8)
+    for word in words:
+        for pos in bloom_positions(word, m, k):
+            bits[pos >> 3] |= 1 << (pos & 7)
+
+    return struct.pack('<4sIII', BLOOM_MAGIC, m, k, n) + bytes(bits)
+
+
+def verify_bloom_filter(data, words, samples=200000):
+    """Check there are no false negatives and return the measured false-positive rate."""
+    magic, m, k, n = struct.unpack_from('<4sIII', data)
+    assert magic == BLOOM_MAGIC
+    bits = data[16:]
+
+    def contains(word):
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in bloom_positions(word, m, k))
+
+    missing = [word for word in words if not contains(word)]
+    if missing:
+        raise ValueError(f"Bloom filter is missing {len(missing)} words, e.g. {missing[:5]}")
+
+    word_set = set(words)
+    rng = random.Random(0)
+    false_positives = 0
+    tested = 0
+    while tested < samples:
+        candidate = ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 8)))
+        if candidate in word_set:
+            continue
+        tested += 1
+        false_positives += contains(candidate)
+    return false_positives / tested
+
+
+def write_bloom_filter(words, path, fp_rate):
+    words = [word.lower() for word in words]
+    data = build_bloom_filter(words, fp_rate)
+    measured = verify_bloom_filter(data, words)
+    print(f"Writing to {path}...")
+    with open(path, 'wb') as f:
+        f.write(data)
+    print(f"  {len(data) / 1024:.0f} KB, target false-positive rate {fp_rate}, measured {measured:.4f}")
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Generate word lists for the word games.")
+    parser.add_argument("--bloom-only", action="store_true",
+                        help="only rebuild the Bloom filter from the existing all-words-8-letter-max.json")
+    parser.add_argument("--bloom-fp", type=float, default=0.005,
+                        help="target false-positive rate for the Bloom filter (default: 0.005)")
+    args = parser.parse_args()
+
     # Setup output directory
     static_dir = Path(__file__).parent.parent / "static"
     static_dir.mkdir(exist_ok=True)
+    all_8_max_path = static_dir / "all-words-8-letter-max.json"
+    bloom_path = static_dir / "all-words-8-letter-max.bloom"
+
+    if args.bloom_only:
+        with open(all_8_max_path, 'r') as f:
+            write_bloom_filter(json.load(f), bloom_path, args.bloom_fp)
+        return 0
 
     # Download Scrabble words (used for all-words.json)
     print("\n=== Downloading Scrabble Words ===")
@@ -77,7 +174,6 @@ def main():
     # Write to files
     common_path = static_dir / "common-words.json"
     all_path = static_dir / "all-words.json"
-    all_8_max_path = static_dir / "all-words-8-letter-max.json"
 
     print("\n=== Writing Files ===")
     print(f"Writing to {common_path}...")
@@ -92,10 +188,13 @@ def main():
     with open(all_8_max_path, 'w') as f:
         json.dump(all_words_8_max, f, indent=2)
 
+    write_bloom_filter(all_words_8_max, bloom_path, args.bloom_fp)
+
     print("\n=== Summary ===")
     print(f"  - common-words.json: {len(common_words)} words (from NLTK Brown corpus)")
     print(f"  - all-words.json: {len(all_words)} words (from norvig.com Scrabble list)")
     print(f"  - all-words-8-letter-max.json: {len(all_words_8_max)} words (Scrabble list, 8 letters max)")
+    print("  - all-words-8-letter-max.bloom: Bloom filter of all-words-8-letter-max.json")
 
     return 0
 
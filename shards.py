@@ -0,0 +1,166 @@
+"""
+Partition in-memory state across worker processes.
+
+Each shard is a process that owns a plain dict of state and applies
+operations to it one at a time, so shard state needs no locks. The front
+process talks to each shard over a multiprocessing Pipe and awaits replies
+on the event loop via add_reader, so a slow shard never blocks the loop.
+
+If a shard process dies, requests waiting on it fail with ShardUnavailable
+and the shard is restarted with empty state after RESTART_DELAY seconds.
+
+Run the app with a single uvicorn worker when sharding is enabled; every
+front process starts its own shards.
+"""
+
+import asyncio
+import itertools
+import multiprocessing
+from logs import log_event
+
+CALL_TIMEOUT = 10.0
+RESTART_DELAY = 1.0
+
+class ShardUnavailable(Exception):
+    """The shard process is down, died while handling the call, or didn't answer in time."""
+
+def _serve(conn, handler):
+    """Shard process main loop: apply (op, kwargs) messages to this shard's state."""
+    import logs
+    logs.start()
+    state = {}
+    try:
+        while True:
+            message = conn.recv()
+            if message is None:
+                break
+            seq, op, kwargs = message
+            try:
+                conn.send((seq, True, handler(state, op, kwargs)))
+            except Exception as e:
+                # The original exception may not be picklable, and a failed send would kill the shard
+                conn.send((seq, False, RuntimeError(f"{op} failed: {e!r}")))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        logs.stop()
+
+class ShardPool:
+    def __init__(self, count: int, handler):
+        """handler(state, op, kwargs) must be a module-level function so it can be sent to the shards."""
+        self.count = count
+        self.handler = handler
+        self.processes = [None] * count
+        self.conns = [None] * count   # None while a shard is down
+        self.restarts: list[asyncio.TimerHandle | None] = [None] * count
+        self.pending: dict[int, tuple[int, asyncio.Future]] = {}  # seq -> (shard, future)
+        self.seq = itertools.count()
+
+    def start(self):
+        for i in range(self.count):
+            self._start_shard(i)
+
+    def _start_shard(self, i: int):
+        loop = asyncio.get_running_loop()
+        ctx = multiprocessing.get_context("spawn")
+        self.restarts[i] = None
+        parent_conn, child_conn = ctx.Pipe()
+        process = ctx.Process(target=_serve, args=(child_conn, self.handler), name=f"shard-{i}", daemon=True)
+        process.start()
+        child_conn.close()
+        loop.add_reader(parent_conn.fileno(), self._on_reply, i)
+        self.processes[i] = process
+        self.conns[i] = parent_conn
+
+    def _shard_died(self, i: int):
+        """Fail the calls waiting on shard i and schedule a restart; the death is logged on restart."""
+        conn = self.conns[i]
+        if conn is None:
+            return
+        loop = asyncio.get_running_loop()
+        loop.remove_reader(conn.fileno())
+        conn.close()
+        self.conns[i] = None
+
+        for seq, (shard, future) in list(self.pending.items()):
+            if shard == i:
+                del self.pending[seq]
+                if not future.done():
+                    future.set_exception(ShardUnavailable(f"Shard {i} died"))
+        self.restarts[i] = loop.call_later(RESTART_DELAY, self._restart_shard, i)
+
+    def _restart_shard(self, i: int):
+        # By now the dead process has been reaped, so exitcode says why it died
+        process = self.processes[i]
+        process.join(timeout=1)
+        if process.is_alive():
+            # Its pipe closed but the process is wedged
+            process.kill()
+            process.join(timeout=1)
+        log_event("shard_died", shard=i, exitcode=process.exitcode)
+        self._start_shard(i)
+
+    def stop(self):
+        loop = asyncio.get_running_loop()
+        for handle in self.restarts:
+            if handle is not None:
+                handle.cancel()
+        for conn in self.conns:
+            if conn is None:
+                continue
+            loop.remove_reader(conn.fileno())
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+        for process in self.processes:
+            if process is None:
+                continue
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for conn in self.conns:
+            if conn is not None:
+                conn.close()
+        for _, future in self.pending.values():
+            future.cancel()
+        self.processes = [None] * self.count
+        self.conns = [None] * self.count
+        self.restarts = [None] * self.count
+        self.pending.clear()
+
+    def _on_reply(self, i: int):
+        conn = self.conns[i]
+        while conn.poll():
+            try:
+                seq, ok, result = conn.recv()
+            except (EOFError, OSError):
+                self._shard_died(i)
+                return
+            _, future = self.pending.pop(seq, (None, None))
+            if future is None or future.done():
+                continue
+            if ok:
+                future.set_result(result)
+            else:
+                future.set_exception(result)
+
+    async def call(self, shard: int, op: str, kwargs: dict):
+        """Run op(**kwargs) on the given shard and return its result; raises ShardUnavailable."""
+        conn = self.conns[shard]
+        if conn is None:
+            raise ShardUnavailable(f"Shard {shard} is restarting")
+        seq = next(self.seq)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[seq] = (shard, future)
+        try:
+            conn.send((seq, op, kwargs))
+        except OSError:
+            self.pending.pop(seq, None)
+            self._shard_died(shard)
+            raise ShardUnavailable(f"Shard {shard} died")
+        try:
+            return await asyncio.wait_for(future, CALL_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.pending.pop(seq, None)
+            raise ShardUnavailable(f"Shard {shard} did not answer within {CALL_TIMEOUT}s")
@@ -1,31 +1,54 @@
+import os
 import random
+from enum import Enum
 from fastapi import APIRouter
 from fastapi.responses import FileResponse
 from pydantic import BaseModel
+from logs import log_event
+from shards import ShardPool, ShardUnavailable
 
 router = APIRouter()
 
 # --- Data Models ---
 
+class Team(str, Enum):
+    STRAIGHT = "straight"
+    GAY = "gay"
+
+class Position(str, Enum):
+    NORMAL = "normal"
+    KING = "king"
+
 class Player:
+    __slots__ = ("name", "team", "position")
+
     def __init__(self, name: str):
         self.name = name
-        self.team = None       # "straight" or "gay"
-        self.position = None   # "king" or "normal"
+        self.team: Team | None = None
+        self.position: Position | None = None
 
 class Room:
-    def __init__(self, room_id: int, creator_name: str):
+    __slots__ = ("room_id", "players", "state", "num_gay", "party_size")
+
+    def __init__(self, room_id: int, creator: Player):
         self.room_id = room_id
-        self.creator_name = creator_name
-        self.players: dict[str, Player] = {}  # keyed by lowercase name
+        self.players: list[Player] = [creator]  # join order; the creator is always first
         self.state = "lobby"   # "lobby" or "playing"
         self.num_gay = 0
         self.party_size = 4
 
+    def is_creator(self, name: str) -> bool:
+        return self.players[0].name.lower() == name.lower()
+
 # --- In-Memory Storage ---
 
 rooms: dict[int, Room] = {}
 
+# With SLUMBERPARTY_SHARDS=K, room N lives in shard process N % K instead of `rooms`
+SHARD_COUNT = int(os.environ.get("SLUMBERPARTY_SHARDS", "0"))
+shard_pool: ShardPool | None = None
+next_create_shard = 0
+
 # --- Request Models ---
 
 class CreateRoomRequest(BaseModel):
@@ -43,54 +66,42 @@ class StartGameRequest(BaseModel):
 
 # --- Helpers ---
 
-def generate_room_id() -> int:
-    existing = set(rooms.keys())
+def generate_room_id(rooms: dict[int, Room], shard: int = 0, shard_count: int = 1) -> int:
+    """Pick a free room ID in 1-1000 that belongs to the given shard (ID % shard_count == shard)."""
+    first = shard or shard_count
     for _ in range(100):
-        rid = random.randint(1, 1000)
-        if rid not in existing:
+        rid = random.randrange(first, 1001, shard_count)
+        if rid not in rooms:
             return rid
-    for rid in range(1, 1001):
-        if rid not in existing:
+    for rid in range(first, 1001, shard_count):
+        if rid not in rooms:
             return rid
     return -1
 
 def get_player(room: Room, name: str):
-    return room.players.get(name.lower())
-
-# --- Routes ---
-
-@router.get("/slumberparty")
-async def slumberparty_page():
-    return FileResponse("pages/slumberparty.html")
+    key = name.lower()
+    for player in room.players:
+        if player.name.lower() == key:
+            return player
+    return None
 
-@router.get("/slumberparty/room")
-async def slumberparty_room_page():
-    return FileResponse("pages/slumberparty.html")
+# --- Room Operations ---
+# These take the rooms dict they act on, so they run unchanged in-process or inside a shard.
 
-@router.post("/slumberparty/api/create-room")
-async def create_room(req: CreateRoomRequest):
-    name = req.player_name.strip()
-    if not name:
-        return {"error": "Name is required"}
-    rid = generate_room_id()
+def create_room_op(rooms: dict[int, Room], name: str, shard: int = 0, shard_count: int = 1) -> dict:
+    rid = generate_room_id(rooms, shard, shard_count)
     if rid == -1:
         return {"error": "No rooms available. Try again later."}
-    player = Player(name)
-    room = Room(rid, name.lower())
-    room.players[name.lower()] = player
-    rooms[rid] = room
+    rooms[rid] = Room(rid, Player(name))
+    log_event("room_created", room_id=rid, player=name)
     return {"room_id": rid}
 
-@router.post("/slumberparty/api/join-room")
-async def join_room(req: JoinRoomRequest):
-    name = req.player_name.strip()
-    if not name:
-        return {"error": "Name is required"}
-    room = rooms.get(req.room_id)
+def join_room_op(rooms: dict[int, Room], room_id: int, name: str) -> dict:
+    room = rooms.get(room_id)
     if not room:
         return {"error": "Room not found"}
-    key = name.lower()
-    existing = room.players.get(key)
+    player = get_player(room, name)
+    existing = player is not None
     if existing:
         # Same name = same player, treat as rejoin
         pass
@@ -98,34 +109,33 @@ async def join_room(req: JoinRoomRequest):
         return {"error": "Game already started"}
     else:
         player = Player(name)
-        room.players[key] = player
+        room.players.append(player)
+    log_event("room_joined", room_id=room_id, player=name, rejoin=existing)
 
     # Return room state along with join response
-    player = room.players[key]
     if room.state == "playing":
         return _game_state_for_player(room, player)
 
-    player_names = [p.name for p in room.players.values()]
+    player_names = [p.name for p in room.players]
     count = len(player_names)
     return {
         "ok": True,
         "state": "lobby",
         "players": player_names,
-        "is_creator": key == room.creator_name,
+        "is_creator": room.is_creator(name),
         "player_count": count,
         "suggested_gay": max(1, round(count / 3)),
         "suggested_party_size": min(count, 4) if count <= 5 else 5,
     }
 
-@router.get("/slumberparty/api/room-state")
-async def room_state(room_id: int, player_name: str):
+def room_state_op(rooms: dict[int, Room], room_id: int, player_name: str) -> dict:
     room = rooms.get(room_id)
     if not room:
         return {"error": "Room not found"}
     player = get_player(room, player_name)
     if not player:
         return {"error": "Player not found in room"}
-    player_names = [p.name for p in room.players.values()]
+    player_names = [p.name for p in room.players]
     count = len(player_names)
     suggested_gay = max(1, round(count / 3))
     suggested_party = min(count, 4) if count <= 5 else 5
@@ -134,7 +144,7 @@ async def room_state(room_id: int, player_name: str):
         return {
             "state": "lobby",
             "players": player_names,
-            "is_creator": player_name.lower() == room.creator_name,
+            "is_creator": room.is_creator(player_name),
             "player_count": count,
             "suggested_gay": suggested_gay,
             "suggested_party_size": suggested_party,
@@ -142,53 +152,134 @@ async def room_state(room_id: int, player_name: str):
     else:
         return _game_state_for_player(room, player)
 
-@router.post("/slumberparty/api/start-game")
-async def start_game(req: StartGameRequest):
-    room = rooms.get(req.room_id)
+def start_game_op(rooms: dict[int, Room], room_id: int, player_name: str, num_gay: int, party_size: int) -> dict:
+    room = rooms.get(room_id)
     if not room:
         return {"error": "Room not found"}
-    if req.player_name.lower() != room.creator_name:
+    if not room.is_creator(player_name):
         return {"error": "Only the room creator can start the game"}
     if room.state != "lobby":
         return {"error": "Game already started"}
-    keys = list(room.players.keys())
-    count = len(keys)
+    players = list(room.players)
+    count = len(players)
     if count < 3:
         return {"error": "Need at least 3 players"}
-    if req.num_gay < 1 or req.num_gay >= count:
+    if num_gay < 1 or num_gay >= count:
         return {"error": "Invalid number of gay players"}
-    if req.party_size < 2 or req.party_size > count:
+    if party_size < 2 or party_size > count:
         return {"error": "Invalid party size"}
 
-    room.num_gay = req.num_gay
-    room.party_size = req.party_size
+    room.num_gay = num_gay
+    room.party_size = party_size
 
-    random.shuffle(keys)
-    gay_keys = set(keys[:req.num_gay])
-    straight_keys = set(keys[req.num_gay:])
+    random.shuffle(players)
+    gay_players = players[:num_gay]
+    straight_players = players[num_gay:]
 
-    for k in gay_keys:
-        room.players[k].team = "gay"
-        room.players[k].position = "normal"
-    for k in straight_keys:
-        room.players[k].team = "straight"
-        room.players[k].position = "normal"
+    for p in gay_players:
+        p.team = Team.GAY
+        p.position = Position.NORMAL
+    for p in straight_players:
+        p.team = Team.STRAIGHT
+        p.position = Position.NORMAL
 
-    room.players[random.choice(list(straight_keys))].position = "king"
-    room.players[random.choice(list(gay_keys))].position = "king"
+    random.choice(straight_players).position = Position.KING
+    random.choice(gay_players).position = Position.KING
 
     room.state = "playing"
-    creator_player = get_player(room, req.player_name)
+    log_event("game_started", room_id=room_id, players=count, num_gay=num_gay, party_size=party_size)
+    creator_player = get_player(room, player_name)
     return _game_state_for_player(room, creator_player)
 
+ROOM_OPS = {
+    "create_room": create_room_op,
+    "join_room": join_room_op,
+    "room_state": room_state_op,
+    "start_game": start_game_op,
+}
+
+def handle_room_op(rooms: dict[int, Room], op: str, kwargs: dict) -> dict:
+    """Shard entry point: apply a room operation to the shard's own rooms dict."""
+    return ROOM_OPS[op](rooms, **kwargs)
+
+async def run_room_op(room_id: int, op: str, **kwargs) -> dict:
+    if shard_pool is None:
+        return ROOM_OPS[op](rooms, room_id=room_id, **kwargs)
+    try:
+        return await shard_pool.call(room_id % SHARD_COUNT, op, {"room_id": room_id, **kwargs})
+    except ShardUnavailable:
+        return {"error": "Room server unavailable. Try again shortly."}
+
+async def start_shards():
+    global shard_pool
+    if SHARD_COUNT > 0 and shard_pool is None:
+        shard_pool = ShardPool(SHARD_COUNT, handle_room_op)
+        shard_pool.start()
+
+async def stop_shards():
+    global shard_pool
+    if shard_pool is not None:
+        shard_pool.stop()
+        shard_pool = None
+
+# --- Routes ---
+
+@router.get("/slumberparty")
+async def slumberparty_page():
+    return FileResponse("pages/slumberparty.html")
+
+@router.get("/slumberparty/room")
+async def slumberparty_room_page():
+    return FileResponse("pages/slumberparty.html")
+
+@router.post("/slumberparty/api/create-room")
+async def create_room(req: CreateRoomRequest):
+    global next_create_shard
+    name = req.player_name.strip()
+    if not name:
+        return {"error": "Name is required"}
+    if shard_pool is None:
+        return create_room_op(rooms, name)
+
+    # Spread new rooms round-robin, falling through to the next shard if one is full or down
+    result = {"error": "Room server unavailable. Try again shortly."}
+    for _ in range(SHARD_COUNT):
+        shard = next_create_shard
+        next_create_shard = (next_create_shard + 1) % SHARD_COUNT
+        try:
+            result = await shard_pool.call(shard, "create_room", {"name": name, "shard": shard, "shard_count": SHARD_COUNT})
+        except ShardUnavailable:
+            continue
+        if "error" not in result:
+            break
+    return result
+
+@router.post("/slumberparty/api/join-room")
+async def join_room(req: JoinRoomRequest):
+    name = req.player_name.strip()
+    if not name:
+        return {"error": "Name is required"}
+    return await run_room_op(req.room_id, "join_room", name=name)
+
+@router.get("/slumberparty/api/room-state")
+async def room_state(room_id: int, player_name: str):
+    return await run_room_op(room_id, "room_state", player_name=player_name)
+
+@router.post("/slumberparty/api/start-game")
+async def start_game(req: StartGameRequest):
+    return await run_room_op(
+        req.room_id, "start_game",
+        player_name=req.player_name, num_gay=req.num_gay, party_size=req.party_size,
+    )
+
 
 def _game_state_for_player(room: Room, player: Player) -> dict:
     """Return all game info a player needs. Called once when the game starts."""
-    gay_names = [p.name for p in room.players.values() if p.team == "gay"]
-    all_names = [p.name for p in room.players.values()]
-    is_gay_king = player.team == "gay" and player.position == "king"
+    gay_names = [p.name for p in room.players if p.team is Team.GAY]
+    all_names = [p.name for p in room.players]
+    is_gay_king = player.team is Team.GAY and player.position is Position.KING
 
-    if player.team == "straight" and player.position == "normal":
+    if player.team is Team.STRAIGHT and player.position is Position.NORMAL:
         knowledge = []
     else:
         knowledge = gay_names
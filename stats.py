@@ -0,0 +1,212 @@
+"""
+Server-side play and completion stats for the daily games.
+
+Events are appended to an in-memory buffer and folded into per-puzzle
+aggregates straight away, so reads never touch disk. A background task
+writes the buffer to SQLite in batches every STATS_FLUSH_INTERVAL seconds,
+or sooner once FLUSH_SIZE events are waiting. Each batch also updates a
+per-(game, day) aggregates table in the same transaction, and startup
+loads that table rather than scanning every event.
+
+Events are only accepted for days up to the game's current puzzle day
+(plus DAY_ALLOWANCE for clients ahead of the server's timezone), so
+clients can't create aggregates for arbitrary days.
+
+Each uvicorn worker keeps its own aggregates. They are complete after a
+restart but only include that worker's events until then.
+"""
+
+import asyncio
+import os
+import sqlite3
+import time
+from datetime import date, datetime, timezone
+from typing import Literal
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field
+from logs import log_event
+
+DB_PATH = os.environ.get("STATS_DB", "stats.db")
+FLUSH_INTERVAL = float(os.environ.get("STATS_FLUSH_INTERVAL", "5"))
+FLUSH_SIZE = 500
+MAX_BUFFER = 100000  # drop new events rather than grow without bound if the database is failing
+DAY_ALLOWANCE = 1
+
+# Mirrors firstDay in each game's page
+FIRST_DAYS = {
+    "fishwish": date(2025, 9, 20),
+    "transformers": date(2025, 10, 3),
+}
+
+def current_day(game: str) -> int:
+    return (datetime.now(timezone.utc).date() - FIRST_DAYS[game]).days
+
+class StatEvent(BaseModel):
+    day: int = Field(ge=0)
+    kind: Literal["play", "complete"]
+    seconds: int = Field(0, ge=0, le=86400)
+    used_hint: bool = False
+
+class Aggregate:
+    __slots__ = ("plays", "completions", "no_hint_completions", "total_seconds")
+
+    def __init__(self, plays=0, completions=0, no_hint_completions=0, total_seconds=0):
+        self.plays = plays
+        self.completions = completions
+        self.no_hint_completions = no_hint_completions
+        self.total_seconds = total_seconds
+
+class StatsStore:
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.conn: sqlite3.Connection | None = None
+        self.buffer: list[tuple] = []
+        self.aggregates: dict[tuple[str, int], Aggregate] = {}
+        self.wakeup: asyncio.Event | None = None
+        self.task: asyncio.Task | None = None
+
+    async def start(self):
+        await run_in_threadpool(self._open)
+        self.wakeup = asyncio.Event()
+        self.task = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        await self.flush()
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def record(self, game: str, event: StatEvent) -> dict:
+        if event.day > current_day(game) + DAY_ALLOWANCE:
+            return {"error": "Invalid day"}
+        if len(self.buffer) >= MAX_BUFFER:
+            return {"error": "Stats are temporarily unavailable"}
+        self.buffer.append((game, event.day, event.kind, event.seconds, int(event.used_hint), int(time.time())))
+
+        agg = self.aggregates.get((game, event.day))
+        if agg is None:
+            agg = self.aggregates[(game, event.day)] = Aggregate()
+        if event.kind == "play":
+            agg.plays += 1
+        else:
+            agg.completions += 1
+            agg.total_seconds += event.seconds
+            if not event.used_hint:
+                agg.no_hint_completions += 1
+
+        if len(self.buffer) >= FLUSH_SIZE and self.wakeup is not None:
+            self.wakeup.set()
+        return {"ok": True}
+
+    def summary(self, game: str, day: int) -> dict:
+        agg = self.aggregates.get((game, day)) or Aggregate()
+        return {
+            "day": day,
+            "plays": agg.plays,
+            "completions": agg.completions,
+            "no_hint_completions": agg.no_hint_completions,
+            "solve_rate": agg.completions / agg.plays if agg.plays else None,
+            "no_hint_rate": agg.no_hint_completions / agg.completions if agg.completions else None,
+            "avg_seconds": agg.total_seconds / agg.completions if agg.completions else None,
+        }
+
+    async def flush(self):
+        if not self.buffer or self.conn is None:
+            return
+        batch, self.buffer = self.buffer, []
+        try:
+            await run_in_threadpool(self._write, batch)
+        except sqlite3.Error as e:
+            # Keep the events for the next attempt
+            self.buffer = batch + self.buffer
+            log_event("stats_flush_failed", error=str(e), pending=len(self.buffer))
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+            await self.flush()
+
+    def _open(self):
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS events (
+                game TEXT NOT NULL,
+                day INTEGER NOT NULL,
+                kind TEXT NOT NULL,
+                seconds INTEGER NOT NULL,
+                used_hint INTEGER NOT NULL,
+                ts INTEGER NOT NULL
+            )
+        """)
+        created = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'aggregates'").fetchone() is None
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS aggregates (
+                game TEXT NOT NULL,
+                day INTEGER NOT NULL,
+                plays INTEGER NOT NULL,
+                completions INTEGER NOT NULL,
+                no_hint_completions INTEGER NOT NULL,
+                total_seconds INTEGER NOT NULL,
+                PRIMARY KEY (game, day)
+            )
+        """)
+        if created:
+            # Databases from before the aggregates table: backfill it once from the events
+            conn.execute("""
+                INSERT INTO aggregates
+                SELECT game, day,
+                       SUM(kind = 'play'),
+                       SUM(kind = 'complete'),
+                       SUM(kind = 'complete' AND used_hint = 0),
+                       SUM(CASE WHEN kind = 'complete' THEN seconds ELSE 0 END)
+                FROM events GROUP BY game, day
+            """)
+        conn.commit()
+        rows = conn.execute("SELECT game, day, plays, completions, no_hint_completions, total_seconds FROM aggregates")
+        self.aggregates = {(game, day): Aggregate(*counts) for game, day, *counts in rows}
+        self.conn = conn
+
+    def _write(self, batch: list[tuple]):
+        deltas: dict[tuple[str, int], list[int]] = {}
+        for game, day, kind, seconds, used_hint, _ in batch:
+            delta = deltas.setdefault((game, day), [0, 0, 0, 0])
+            if kind == "play":
+                delta[0] += 1
+            else:
+                delta[1] += 1
+                delta[2] += not used_hint
+                delta[3] += seconds
+
+        # One transaction, so the aggregates never disagree with the events;
+        # rolled back on error so a retried batch isn't written twice
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO events (game, day, kind, seconds, used_hint, ts) VALUES (?, ?, ?, ?, ?, ?)",
+                batch,
+            )
+            self.conn.executemany(
+                """
+                INSERT INTO aggregates (game, day, plays, completions, no_hint_completions, total_seconds)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (game, day) DO UPDATE SET
+                    plays = plays + excluded.plays,
+                    completions = completions + excluded.completions,
+                    no_hint_completions = no_hint_completions + excluded.no_hint_completions,
+                    total_seconds = total_seconds + excluded.total_seconds
+                """,
+                [(game, day, *delta) for (game, day), delta in deltas.items()],
+            )
+
+stats_store = StatsStore(DB_PATH)
@@ -1,8 +1,84 @@
+import asyncio
+import json
 from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse
+from stats import StatEvent, stats_store
+from wordgraph import UNREACHABLE, WordGraph, load_word_graph
 
 router = APIRouter()
 
+WORDS_FILE = "static/all-words-8-letter-max.json"
+GAMES_FILE = "static/transformer-games.json"
+
+# --- Solver ---
+
+_graph: WordGraph | None = None
+_games: list[list[str]] = []
+_distances: dict[str, bytearray] = {}  # keyed by target word
+_solver_lock = asyncio.Lock()
+
+def _load_graph() -> WordGraph:
+    """The word graph, built by the first worker to need it and shared with the rest."""
+    return load_word_graph(WORDS_FILE)
+
+def _load_games() -> list[list[str]]:
+    with open(GAMES_FILE, 'r') as f:
+        return [[w.lower() for w in game] for game in json.load(f)]
+
+async def get_distances(target: str) -> bytearray | None:
+    """Distance map to target, built once per target word and cached."""
+    global _graph
+    if target in _distances:
+        return _distances[target]
+    async with _solver_lock:
+        if _graph is None:
+            _graph = await run_in_threadpool(_load_graph)
+        if target not in _distances:
+            i = _graph.words.find(target)
+            if i < 0:
+                return None
+            _distances[target] = await run_in_threadpool(_graph.distances_to, i)
+    return _distances[target]
+
+# --- Routes ---
+
 @router.get("/transformers")
 async def transformers():
     return FileResponse("pages/transformers.html")
+
+@router.get("/transformers/api/hint")
+async def hint(day: int, word: str):
+    """Steps remaining from word to the target of the given day's puzzle, and the best next words."""
+    global _games
+    if not _games:
+        _games = _load_games()
+    game = _games[day % len(_games)]
+    target = game[-1]
+    dist = await get_distances(target)
+    if dist is None:
+        return {"error": "Puzzle target is not in the word list"}
+
+    word = word.strip().lower()
+    i = _graph.words.find(word)
+    if i < 0:
+        return {"error": "Not a valid word"}
+    steps = dist[i]
+    if steps == UNREACHABLE:
+        return {"error": "Target cannot be reached from this word"}
+
+    next_words = sorted(_graph.words[v] for v in _graph.neighbors(i) if dist[v] == steps - 1)
+    return {
+        "word": word,
+        "target": target,
+        "steps_remaining": steps,
+        "next_words": next_words,
+    }
+
+@router.post("/transformers/api/stats")
+async def record_stat(event: StatEvent):
+    return stats_store.record("transformers", event)
+
+@router.get("/transformers/api/stats")
+async def puzzle_stats(day: int):
+    return stats_store.summary("transformers", day)
@@ -0,0 +1,124 @@
+"""
+Transformation graph over a WordIndex, stored as flat CSR adjacency arrays.
+
+Kept free of the web stack so offline scripts can use it. With uvicorn
+--workers, load_word_graph() builds the graph in the first worker that
+needs it and publishes the arrays in a shared memory segment next to the
+word index; the other workers attach instead of rebuilding.
+
+    graph = load_word_graph("static/all-words-8-letter-max.json")
+    dist = graph.distances_to(graph.words.find("crane"))
+"""
+
+import os
+import struct
+from array import array
+from collections import deque
+from wordindex import WordIndex, load_shared, load_word_index
+
+UNREACHABLE = 255
+
+class WordGraph:
+    """
+    Transformation graph over the dictionary, stored as flat adjacency arrays.
+
+    Two words are adjacent if one can be turned into the other by removing,
+    inserting or replacing a single letter, or by rearranging the letters.
+    Every move has an inverse, so a BFS from the target word gives the number
+    of steps remaining from every other word.
+    """
+
+    def __init__(self, words: WordIndex, offsets=None, edges=None):
+        """Use prebuilt offsets/edges (int32 buffers) if given, otherwise build them."""
+        self.words = words
+        if offsets is None:
+            offsets, edges = build_adjacency(words)
+        self.offsets = offsets
+        self.edges = edges
+
+    def neighbors(self, i: int):
+        return self.edges[self.offsets[i]:self.offsets[i + 1]]
+
+    def distances_to(self, target: int) -> bytearray:
+        """BFS from target; distance per word id, UNREACHABLE if disconnected."""
+        dist = bytearray([UNREACHABLE]) * len(self.words)
+        dist[target] = 0
+        queue = deque([target])
+        while queue:
+            u = queue.popleft()
+            d = dist[u] + 1
+            if d >= UNREACHABLE:
+                continue
+            for v in self.neighbors(u):
+                if dist[v] == UNREACHABLE:
+                    dist[v] = d
+                    queue.append(v)
+        return dist
+
+def build_adjacency(words: WordIndex) -> tuple[array, array]:
+    """CSR adjacency (offsets, edges) for the transformation graph over words."""
+    # Temporary lookup tables, dropped once the adjacency arrays are built
+    position = {w: i for i, w in enumerate(words)}
+    by_sorted: dict[str, list[int]] = {}
+    by_deletion: dict[str, list[tuple[int, int]]] = {}  # word minus one letter -> (word id, position)
+    for i, w in enumerate(words):
+        by_sorted.setdefault(''.join(sorted(w)), []).append(i)
+        for j in range(len(w)):
+            by_deletion.setdefault(w[:j] + w[j+1:], []).append((i, j))
+
+    offsets = array('i', [0])
+    edges = array('i')
+    for i, w in enumerate(words):
+        neighbors = set(by_sorted[''.join(sorted(w))])
+        for j in range(len(w)):
+            removed = w[:j] + w[j+1:]
+            if removed in position:
+                neighbors.add(position[removed])
+            # Same deletion at the same position = single letter replacement
+            neighbors.update(v for v, pos in by_deletion[removed] if pos == j)
+        # Words that delete down to w are insertions of w
+        neighbors.update(v for v, _ in by_deletion.get(w, ()))
+        neighbors.discard(i)
+        edges.extend(neighbors)
+        offsets.append(len(edges))
+    return offsets, edges
+
+# Shared segment layout: header, then offsets (count + 1 int32s), then edges
+GRAPH_MAGIC = b"WGR1"
+GRAPH_HEADER = struct.Struct("<4sII")  # magic, word count, edge count
+GRAPH_HEADER_SIZE = 16
+
+def build_graph_segment(words: WordIndex) -> bytes:
+    offsets, edges = build_adjacency(words)
+    header = GRAPH_HEADER.pack(GRAPH_MAGIC, len(words), len(edges)).ljust(GRAPH_HEADER_SIZE, b"\0")
+    return header + offsets.tobytes() + edges.tobytes()
+
+class SharedWordGraph(WordGraph):
+    """WordGraph over adjacency arrays that live in a shared memory segment."""
+
+    def __init__(self, words: WordIndex, buf):
+        magic, count, edge_count = GRAPH_HEADER.unpack_from(buf)
+        if magic != GRAPH_MAGIC or count != len(words):
+            raise ValueError("Not a word graph for this word index")
+        self._view = memoryview(buf)
+        edges_start = GRAPH_HEADER_SIZE + 4 * (count + 1)
+        offsets = self._view[GRAPH_HEADER_SIZE:edges_start].cast("i")
+        edges = self._view[edges_start:edges_start + 4 * edge_count].cast("i")
+        super().__init__(words, offsets, edges)
+
+    def release(self):
+        self.offsets.release()
+        self.edges.release()
+        self._view.release()
+
+def load_word_graph(path, shared: bool = True) -> WordGraph:
+    """The word graph for a JSON word list, shared across processes unless disabled."""
+    words = load_word_index(path, shared)
+    if not shared or os.environ.get("WORD_INDEX_SHARED", "1") == "0":
+        return WordGraph(words)
+    return load_shared(
+        "wordgraph", path,
+        lambda: build_graph_segment(words),
+        lambda buf: SharedWordGraph(words, buf),
+        version=GRAPH_MAGIC.decode(),
+    )
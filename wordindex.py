@@ -0,0 +1,222 @@
+"""
+Read-only word index that can be shared between processes.
+
+The dictionary is stored as one sorted blob of words plus a uint32 offset
+table, so lookups are a binary search over raw bytes and no per-word Python
+strings are kept around. With uvicorn --workers, the first worker to load a
+word list publishes it in a multiprocessing.shared_memory segment and the
+others attach to it, so memory stays flat as workers are added.
+
+Segments are named after the word list's path, size and mtime, so an edited
+list gets a fresh segment, and publishing it unlinks the segments left by
+earlier versions of the same list. They are deliberately not unlinked when
+a worker exits, so restarted workers attach instantly. Set
+WORD_INDEX_SHARED=0 to keep a private copy per process instead.
+
+load_shared() does the same for any other structure derived from a file,
+such as the Transformers word graph.
+
+    index = load_word_index("static/all-words-8-letter-max.json")
+    "crane" in index
+    index.find("crane")   # position in sorted order, or -1
+    index[i]              # word at position i
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import struct
+import threading
+import time
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+
+MAGIC = b"WIX1"
+HEADER = struct.Struct("<4sII")  # magic, word count, blob length
+HEADER_SIZE = 16
+
+class WordIndex:
+    def __init__(self, buf):
+        magic, count, blob_len = HEADER.unpack_from(buf)
+        if magic != MAGIC:
+            raise ValueError("Not a word index")
+        view = memoryview(buf)
+        offsets_end = HEADER_SIZE + 4 * (count + 1)
+        self._count = count
+        self._view = view
+        self._offsets = view[HEADER_SIZE:offsets_end].cast("I")
+        self._blob = view[offsets_end:offsets_end + blob_len]
+
+    def release(self):
+        """Release the views on the underlying buffer so it can be closed."""
+        self._offsets.release()
+        self._blob.release()
+        self._view.release()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> str:
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        return str(self._blob[self._offsets[i]:self._offsets[i + 1]], "utf-8")
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self[i]
+
+    def __contains__(self, word: str) -> bool:
+        return self.find(word) >= 0
+
+    def find(self, word: str) -> int:
+        """Position of word in the index, or -1 if it is not there."""
+        key = word.encode("utf-8")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            candidate = bytes(self._blob[self._offsets[mid]:self._offsets[mid + 1]])
+            if candidate < key:
+                lo = mid + 1
+            elif candidate > key:
+                hi = mid
+            else:
+                return mid
+        return -1
+
+def build_word_index(words) -> bytes:
+    """Serialize words (lowercased, deduplicated, sorted) into the index layout."""
+    encoded = sorted({w.lower().encode("utf-8") for w in words})
+    offsets = [0]
+    for w in encoded:
+        offsets.append(offsets[-1] + len(w))
+    blob = b"".join(encoded)
+    header = HEADER.pack(MAGIC, len(encoded), len(blob)).ljust(HEADER_SIZE, b"\0")
+    return header + struct.pack(f"<{len(offsets)}I", *offsets) + blob
+
+_segments: list[tuple[SharedMemory, object]] = []  # keeps attached segments mapped
+
+SHM_DIR = Path("/dev/shm")
+BUILD_TIMEOUT = 60.0
+
+@atexit.register
+def _close_segments():
+    for shm, obj in _segments:
+        obj.release()
+        shm.close()
+
+def _segment_prefix(kind: str, path: Path) -> str:
+    return f"{kind}-" + hashlib.sha1(str(path.resolve()).encode()).hexdigest()[:8] + "-"
+
+def _segment_name(kind: str, path: Path, version: str = "") -> str:
+    stat = path.stat()
+    key = f"{stat.st_size}:{stat.st_mtime_ns}:{version}"
+    return _segment_prefix(kind, path) + hashlib.sha1(key.encode()).hexdigest()[:12]
+
+_tracker_lock = threading.Lock()
+
+def _open_segment(name: str, create: bool = False, size: int = 0) -> SharedMemory:
+    """
+    Open a segment without registering it with the resource tracker, which
+    would unlink it when this process exits and pull it out from under the
+    other workers. Unregistering afterwards isn't enough: spawned workers
+    share one tracker, so a second unregister of the same name errors there.
+    """
+    with _tracker_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return SharedMemory(name=name, create=create, size=size)
+        finally:
+            resource_tracker.register = register
+
+def _unlink(name: str):
+    try:
+        os.unlink(SHM_DIR / name)
+    except FileNotFoundError:
+        pass
+
+def _unlink_stale(prefix: str, current: str):
+    """Remove segments left by earlier versions of the same file; processes still attached keep their mapping."""
+    if not SHM_DIR.is_dir():
+        return
+    for entry in SHM_DIR.glob(prefix + "*"):
+        if entry.name != current and not entry.name.endswith("-building"):
+            _unlink(entry.name)
+
+def _attach(name: str, timeout: float = 30.0) -> SharedMemory:
+    """Attach to a segment, waiting up to timeout for its creator to finish writing it."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            shm = _open_segment(name)
+        except (FileNotFoundError, ValueError):
+            # Not created yet, or created but not yet sized by its owner
+            shm = None
+        if shm is not None:
+            # Segments start zeroed and the magic is written last
+            if shm.size >= 4 and any(shm.buf[:4]):
+                return shm
+            shm.close()
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Shared segment {name} was never published")
+        time.sleep(0.01)
+
+def _publish(name: str, data: bytes) -> SharedMemory:
+    shm = _open_segment(name, create=True, size=len(data))
+    # Write the magic last so attaching processes only see a complete segment
+    shm.buf[4:len(data)] = data[4:]
+    shm.buf[:4] = data[:4]
+    return shm
+
+def load_shared(kind: str, path, build, wrap, version: str = ""):
+    """
+    wrap(buffer) for the segment derived from path, building it with build()
+    only if no process has published it yet. build() must return bytes that
+    start with a non-zero 4 byte magic; wrap's result must have release().
+
+    One process builds while the others wait for it, so the cost of building
+    is paid once per host rather than once per worker.
+    """
+    path = Path(path)
+    name = _segment_name(kind, path, version)
+    try:
+        shm = _attach(name, timeout=0)
+    except TimeoutError:
+        try:
+            _open_segment(name + "-building", create=True, size=1).close()
+        except FileExistsError:
+            try:
+                shm = _attach(name, timeout=BUILD_TIMEOUT)
+            except TimeoutError:
+                # The builder died without publishing; take over
+                shm = None
+        else:
+            shm = None
+        if shm is None:
+            try:
+                data = build()
+                try:
+                    shm = _publish(name, data)
+                except FileExistsError:
+                    shm = _attach(name)
+            finally:
+                _unlink(name + "-building")
+            _unlink_stale(_segment_prefix(kind, path), name)
+
+    obj = wrap(shm.buf)
+    _segments.append((shm, obj))
+    return obj
+
+def load_word_index(path, shared: bool = True) -> WordIndex:
+    """Load a JSON word list as a WordIndex, shared across processes unless disabled."""
+    path = Path(path)
+
+    def build():
+        with open(path, 'r') as f:
+            return build_word_index(json.load(f))
+
+    if not shared or os.environ.get("WORD_INDEX_SHARED", "1") == "0":
+        return WordIndex(build())
+    return load_shared("wordindex", path, build, WordIndex)